@@ -12,6 +12,20 @@ import asyncssh
 _LOGGER = logging.getLogger(__name__)
 
 _PATH_EXPORT_COMMAND = "PATH=$PATH:/bin:/usr/sbin:/sbin"
+
+_LOGIN_PROMPT = b"login: "
+_PASSWORD_PROMPT = b"Password: "
+_COMMAND_PROMPT = b"#"
+_LINEBREAK_PROBE = b" " * 200 + b"\n"
+
+# Seconds to wait for the output of a single command
+_COMMAND_TIMEOUT = 9
+
+# Marker echoed between chained commands to split their output again, the
+# extra echo puts it on its own line when a command's output lacks a newline
+_COMMAND_SEPARATOR = "__AIOASUSWRT_SEPARATOR__"
+_COMMAND_CHAIN = f"; echo; echo {_COMMAND_SEPARATOR}; "
+
 asyncssh.set_log_level("WARNING")
 
 
@@ -39,23 +53,44 @@ class _BaseConnection(abc.ABC):
 
         return ret
 
-    async def async_run_command(self, command: str, retry=True) -> List[str]:
+    async def async_run_command(
+        self, command: str, retry=True, timeout: float = _COMMAND_TIMEOUT
+    ) -> List[str]:
         """ Call a command using the connection."""
         async with self._io_lock:
             if not self.is_connected:
                 await self.async_connect()
 
             try:
-                return await self._async_call_command(command)
+                return await self._async_call_command(command, timeout)
             except _CommandException:
                 pass
 
         # The command failed
         if retry:
             _LOGGER.debug(f"Retrying command: {command}")
-            return await self._async_call_command(command)
+            return await self._async_call_command(command, timeout)
         return []
 
+    async def async_run_commands(self, commands: List[str], retry=True) -> List[List[str]]:
+        """ Call several commands in one round trip, returns the output per command."""
+        # Every command keeps its own time budget within the batch
+        lines = await self.async_run_command(
+            _COMMAND_CHAIN.join(commands), retry, _COMMAND_TIMEOUT * len(commands)
+        )
+        results: List[List[str]] = [[]]
+        for line in lines:
+            if line.rstrip() == _COMMAND_SEPARATOR:
+                # Drop the blank line of the echo in front of the separator
+                if results[-1] and not results[-1][-1].strip():
+                    results[-1].pop()
+                results.append([])
+            else:
+                results[-1].append(line)
+        # Nothing came back at all when the call failed
+        results.extend([] for _ in range(len(commands) - len(results)))
+        return results
+
     async def async_connect(self):
         if self.is_connected:
             _LOGGER.debug(f"Connection already established to: {self.description}")
@@ -69,7 +104,7 @@ class _BaseConnection(abc.ABC):
             self._disconnect()
 
     @abc.abstractmethod
-    async def _async_call_command(self, command: str) -> List[str]:
+    async def _async_call_command(self, command: str, timeout: float) -> List[str]:
         """ Call the command."""
         pass
 
@@ -126,7 +161,7 @@ class SshConnection(_BaseConnection):
         self._client = None
         self._lock = asyncio.Lock()
 
-    async def _async_call_command(self, command: str) -> List[str]:
+    async def _async_call_command(self, command: str, timeout: float) -> List[str]:
         """Run commands through an SSH connection.
         Connect to the SSH server if not currently connected, otherwise
         use the existing connection.
@@ -143,7 +178,7 @@ class SshConnection(_BaseConnection):
                 async with self._lock:
                   result = await asyncio.wait_for(
                       self._client.run("%s && %s" % (_PATH_EXPORT_COMMAND, command)),
-                      9,
+                      timeout,
                   )
             except asyncssh.misc.ChannelOpenError:
                 if not retry:
@@ -202,10 +237,10 @@ class TelnetConnection(_BaseConnection):
         super().__init__(host, port or 23, username, password)
         self._reader: Optional[StreamReader] = None
         self._writer: Optional[StreamWriter] = None
-        self._prompt_string = "".encode("ascii")
+        self._prompt_string = b""
         self._linebreak: Optional[float] = None
 
-    async def _async_call_command(self, command):
+    async def _async_call_command(self, command, timeout):
         """Run a command through a Telnet connection. If first_try is True a second
         attempt will be done if the first try fails."""
         try:
@@ -223,7 +258,7 @@ class TelnetConnection(_BaseConnection):
             self._writer.write((full_cmd + "\n").encode("ascii"))
             # And read back the data till the prompt string
             data = await asyncio.wait_for(
-                self._reader.readuntil(self._prompt_string), 9
+                self._reader.readuntil(self._prompt_string), timeout
             )
         except (BrokenPipeError, LimitOverrunError, IncompleteReadError) as ex:
             # Writing has failed, Let's close and retry if necessary
@@ -256,7 +291,7 @@ class TelnetConnection(_BaseConnection):
         # Process the login
         # Enter the Username
         try:
-            await asyncio.wait_for(self._reader.readuntil(b"login: "), 9)
+            await asyncio.wait_for(self._reader.readuntil(_LOGIN_PROMPT), 9)
         except asyncio.IncompleteReadError:
             _LOGGER.error(
                 "Unable to read from router on %s:%s" % (self._host, self._port)
@@ -269,11 +304,11 @@ class TelnetConnection(_BaseConnection):
         self._writer.write((self._username or "" + "\n").encode("ascii"))
 
         # Enter the password
-        await self._reader.readuntil(b"Password: ")
+        await self._reader.readuntil(_PASSWORD_PROMPT)
         self._writer.write((self._password or "" + "\n").encode("ascii"))
 
         # Now we can determine the prompt string for the commands.
-        self._prompt_string = (await self._reader.readuntil(b"#")).split(b"\n")[-1]
+        self._prompt_string = (await self._reader.readuntil(_COMMAND_PROMPT)).split(b"\n")[-1]
 
     async def _async_linebreak(self) -> float:
         """Telnet or asyncio seems to be adding linebreaks due to terminal size,
@@ -283,26 +318,27 @@ class TelnetConnection(_BaseConnection):
         if not self._writer or not self._reader:
             raise _CommandException
 
-        self._writer.write((" " * 200 + "\n").encode("ascii"))
+        self._writer.write(_LINEBREAK_PROBE)
         input_bytes = await self._reader.readuntil(self._prompt_string)
 
         return self._determine_linebreak(input_bytes)
 
     def _determine_linebreak(self, input_bytes: bytes) -> float:
-        # Let's convert the data to the expected format
-        data = input_bytes.decode("utf-8").replace("\r", "").split("\n")
+        # Only the first two lines are needed, leave the rest of the data
+        data = input_bytes.split(b"\n", 2)
         if len(data) == 1:
             # There was no split, so assume infinite
             linebreak = float("inf")
         else:
             # The linebreak is the length of the prompt string + the first line
-            linebreak = len(self._prompt_string) + len(data[0])
+            linebreak = len(self._prompt_string) + len(data[0].replace(b"\r", b""))
 
             if len(data) > 2:
                 # We can do a quick sanity check, as there are more linebreaks
-                if len(data[1]) != linebreak:
+                second_line = len(data[1].replace(b"\r", b""))
+                if second_line != linebreak:
                     _LOGGER.warning(
-                        f"Inconsistent linebreaks {len(data[1])} != " f"{linebreak}"
+                        f"Inconsistent linebreaks {second_line} != " f"{linebreak}"
                     )
 
         return linebreak
@@ -58,10 +58,8 @@ class MockReader:
             self._comd = new_cmd
 
     async def readuntil(self, read_till: bytes) -> bytes:
-        # Let's create the return string from the cmd and the return string
-        ret_val = self._cmd + "\n".encode("ascii")
-        ret_val = ret_val + _RETURN_VAL + "\n".encode("ascii") + _PROMPT
-        return ret_val
+        # Let's create the whole reply from the cmd and the return string at once
+        return b"".join((self._cmd, b"\n", _RETURN_VAL, b"\n", _PROMPT))
 
 
 def set_prompt(new_prompt):
@@ -71,7 +69,6 @@ def set_prompt(new_prompt):
 
 def set_return(new_return: str):
     global _RETURN_VAL
-    print(f"set reutrn: {new_return}")
     _RETURN_VAL = new_return.encode("ascii")
 
 
@@ -87,7 +84,6 @@ def raise_exception_on_write(exception_type):
 
 async def open_connection(*args, **kwargs) -> Tuple[MockReader, MockWriter]:
     global _READER, _WRITER
-    print("MOCKED OPEN")
     _READER = MockReader()
     _WRITER = MockWriter()
     # Clear previously configured variables.
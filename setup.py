@@ -18,7 +18,7 @@ with open("README.md", "r") as fh:
 install_requires = ["asyncssh"]
 
 extras_requires = {
-    "dev": ["check-manifest"],
+    "dev": ["check-manifest", "pytest-xdist", "pytest-socket"],
 }
 
 github_url = "https://github.com/kennedyshead/aioasuswrt"
@@ -1,5 +1,23 @@
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
-from aioasuswrt.asuswrt import AsusWrt
+from aioasuswrt.asuswrt import (
+    _ARP_CMD,
+    _IP_NEIGH_CMD,
+    _LEASES_CMD,
+    _TEMP_CMDS,
+    _WL_CMD,
+    GET_LIST,
+    _WL_REGEX,
+    AsusWrt,
+    _parse_lines,
+)
+from aioasuswrt.connection import _COMMAND_CHAIN, _COMMAND_SEPARATOR, _COMMAND_TIMEOUT
 
 from .test_data import (
     ARP_DATA,
@@ -15,146 +33,261 @@ from .test_data import (
     RX_DATA,
     TEMP_DATA,
     TEMP_DATA_2ND,
+    TEMP_KNOWN_DATA,
     TX,
     TX_DATA,
     WAKE_DEVICES_AP,
     WAKE_DEVICES_NO_IP,
+    WAKE_DEVICES_ROUTER,
     WL_DATA,
     WL_DEVICES,
 )
 
 
-def mock_run_cmd(mocker, values):
-    iter = 0
+@pytest.fixture
+def run_cmd(mocker):
+    """Mocked ssh command call, queue its output through side_effect."""
+    replies = mocker.Mock()
 
-    async def patch_func(command, *args, **kwargs):
-        nonlocal iter
-        print(f"Command: {command}\nwith args={args} and kwargs={kwargs}")
-        iter = iter + 1
-        try:
-            return values[iter - 1]
-        except IndexError:
-            print(
-                f"Not enough elements in return list! Iteration {iter} while list is {len(values)}."
-            )
-            assert False
+    async def run_command(*args, **kwargs):
+        return replies(*args, **kwargs)
 
     mocker.patch(
         "aioasuswrt.connection.SshConnection.async_run_command",
-        side_effect=patch_func,
+        side_effect=run_command,
     )
+    return replies
+
+
+@pytest.fixture(scope="module")
+def scanner():
+    """Scanner shared by the tests of the getters that cache nothing."""
+    return AsusWrt(host="localhost", port=22)
+
+
+@pytest.fixture(scope="session")
+def nvram_fixtures():
+    """Load the nvram test data once per session."""
+    return json.loads((Path(__file__).parent / "data" / "nvram.json").read_text())
+
+
+_DUMMY_RE = re.compile(r"abc123")
+
+_TEMPS_COMMANDS_DEFAULT = [commands[0] for commands in _TEMP_CMDS]
+_TEMP_RESPONSES = {
+    command["cmd"]: data for command, data in zip(_TEMPS_COMMANDS_DEFAULT, TEMP_KNOWN_DATA)
+}
+
+_LEASES_KEY = _LEASES_CMD.format("/var/lib/misc")
+_CMD_TABLE = {
+    _WL_CMD: WL_DATA,
+    _ARP_CMD: ARP_DATA,
+    _IP_NEIGH_CMD: NEIGH_DATA,
+    _LEASES_KEY: LEASES_DATA,
+}
+
+
+def successful_get_devices_commands(command, *args, **kwargs):
+    """Return the data for the (chained) device discovery commands."""
+    output = []
+    for i, part in enumerate(command.split(_COMMAND_CHAIN)):
+        if i:
+            # The blank line of the echo in front of the separator
+            output.extend(("", _COMMAND_SEPARATOR))
+        output.extend(_CMD_TABLE.get(part) or [])
+    return output
+
 
+@pytest.fixture
+def patched_ssh(run_cmd):
+    """Answer the device discovery commands over a mocked ssh connection."""
+    run_cmd.side_effect = successful_get_devices_commands
+    return run_cmd
 
-@pytest.mark.asyncio
-async def test_get_wl(event_loop, mocker):
+
+async def test_run_commands_splits_output(patched_ssh, scanner):
+    """Chained commands are sent once and their output is split again."""
+    result = await scanner.connection.async_run_commands([_WL_CMD, "unknown", _ARP_CMD])
+    assert patched_ssh.call_count == 1
+    assert patched_ssh.call_args[0][2] == 3 * _COMMAND_TIMEOUT
+    assert result == [list(WL_DATA), [], list(ARP_DATA)]
+
+
+async def test_run_commands_no_trailing_newline(run_cmd, scanner):
+    """Output without a trailing newline still puts the separator on its own line."""
+    clientlist = '{"a":{}}'
+    # cat prints no newline, so only the echo ends the clientlist line
+    run_cmd.return_value = [clientlist, _COMMAND_SEPARATOR, *LEASES_DATA, ""]
+    result = await scanner.connection.async_run_commands(["cat /tmp/clientlist.json", _LEASES_KEY])
+    assert result == [[clientlist], [*LEASES_DATA, ""]]
+
+
+async def test_parse_lines_wrong_input():
+    """Testing parse lines with input that does not match."""
+    assert await _parse_lines(["asdf asdfdfsafad"], _DUMMY_RE) == []
+    # A match may not continue on the next line
+    assert await _parse_lines(["assoclist", "01:02:03:04:06:08\r"], _WL_REGEX) == []
+
+
+async def test_get_wl(run_cmd, scanner):
     """Testing wl."""
-    mock_run_cmd(mocker, [WL_DATA])
-    scanner = AsusWrt(host="localhost", port=22)
+    run_cmd.side_effect = [WL_DATA]
     devices = await scanner.async_get_wl()
     assert WL_DEVICES == devices
 
 
-@pytest.mark.asyncio
-async def test_get_wl_empty(event_loop, mocker):
+async def test_get_wl_empty(run_cmd, scanner):
     """Testing wl."""
-    mock_run_cmd(mocker, [""])
-    scanner = AsusWrt(host="localhost", port=22)
+    run_cmd.side_effect = [""]
     devices = await scanner.async_get_wl()
     assert {} == devices
 
 
-@pytest.mark.asyncio
-async def test_async_get_leases(event_loop, mocker):
+async def test_async_get_leases(run_cmd, scanner):
     """Testing leases."""
-    mock_run_cmd(mocker, [LEASES_DATA])
-    scanner = AsusWrt(host="localhost", port=22)
+    run_cmd.side_effect = [LEASES_DATA]
     data = await scanner.async_get_leases(NEIGH_DEVICES.copy())
     assert LEASES_DEVICES == data
 
 
-@pytest.mark.asyncio
-async def test_get_arp(event_loop, mocker):
+async def test_get_arp(run_cmd, scanner):
     """Testing arp."""
-    mock_run_cmd(mocker, [ARP_DATA])
-    scanner = AsusWrt(host="localhost", port=22)
+    run_cmd.side_effect = [ARP_DATA]
     data = await scanner.async_get_arp()
     assert ARP_DEVICES == data
 
 
-@pytest.mark.asyncio
-async def test_get_neigh(event_loop, mocker):
+async def test_get_neigh(run_cmd, scanner):
     """Testing neigh."""
-    mock_run_cmd(mocker, [NEIGH_DATA])
-    scanner = AsusWrt(host="localhost", port=22)
+    run_cmd.side_effect = [NEIGH_DATA]
     data = await scanner.async_get_neigh(NEIGH_DEVICES.copy())
     assert NEIGH_DEVICES == data
 
 
-@pytest.mark.asyncio
-async def test_get_connected_devices_ap(event_loop, mocker):
-    """Test for get asuswrt_data in ap mode."""
-    # Note, unfortunately the order of data is important and should be the
-    # same as in the `async_get_connected_devices` function.
-    mock_run_cmd(mocker, [WL_DATA, ARP_DATA, NEIGH_DATA, LEASES_DATA])
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=True)
-    data = await scanner.async_get_connected_devices()
-    assert WAKE_DEVICES_AP == data
+async def test_get_neigh_without_devices(run_cmd, scanner):
+    """Neigh ignores the current devices, they may be left out."""
+    run_cmd.side_effect = [NEIGH_DATA, NEIGH_DATA]
+    assert await scanner.async_get_neigh() == NEIGH_DEVICES
+    assert await scanner.async_get_neigh({}) == NEIGH_DEVICES
 
 
-@pytest.mark.asyncio
-async def test_get_connected_devices_no_ip(event_loop, mocker):
-    """Test for get asuswrt_data and not requiring ip."""
-    mock_run_cmd(mocker, [WL_DATA, ARP_DATA, NEIGH_DATA, LEASES_DATA])
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+@pytest.mark.parametrize(
+    "mode,require_ip,expected",
+    [
+        ("ap", True, WAKE_DEVICES_AP),
+        ("ap", False, WAKE_DEVICES_NO_IP),
+        ("router", False, WAKE_DEVICES_ROUTER),
+    ],
+)
+async def test_get_connected_devices(patched_ssh, mode, require_ip, expected):
+    """Test for get asuswrt_data per mode, with and without requiring an ip."""
+    scanner = AsusWrt(host="localhost", port=22, mode=mode, require_ip=require_ip)
     data = await scanner.async_get_connected_devices()
-    assert WAKE_DEVICES_NO_IP == data
+    assert expected == data
 
 
-@pytest.mark.asyncio
-async def test_get_packets_total(event_loop, mocker):
+async def test_get_nvram(run_cmd, nvram_fixtures):
+    """Test getting nvram values."""
+    run_cmd.side_effect = [nvram_fixtures["dhcp_data"]]
+    # The nvram output is cached per scanner, so don't share one
+    scanner = AsusWrt(host="localhost", port=22)
+    data = await scanner.async_get_nvram("DHCP")
+    assert data == nvram_fixtures["dhcp_values"]
+    assert list(data) == [item for item in GET_LIST["DHCP"] if item in data]
+
+
+async def test_get_nvram_changed_get_list(run_cmd, monkeypatch):
+    """A GET_LIST entry changed by the caller is used on the next call."""
+    run_cmd.side_effect = [["model=RT-AC68U", "productid=RT-AC68U_V3"]]
+    scanner = AsusWrt(host="localhost", port=22)
+    monkeypatch.setitem(GET_LIST, "MODEL", ["productid"])
+    assert await scanner.async_get_nvram("MODEL") == {"productid": "RT-AC68U_V3"}
+
+
+async def test_get_packets_total(run_cmd, scanner):
     """Test getting packet totals."""
-    mock_run_cmd(mocker, [TX_DATA, RX_DATA])
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+    run_cmd.side_effect = [TX_DATA, RX_DATA]
     data = await scanner.async_get_tx()
     assert TX == data
+    assert isinstance(data, int)
     data = await scanner.async_get_rx()
     assert RX == data
+    assert isinstance(data, int)
+
+
+async def test_concurrent_commands_share_result(run_cmd, scanner):
+    """Identical commands in flight at the same time are only sent once."""
+    run_cmd.return_value = RX_DATA
+    assert await asyncio.gather(scanner.async_get_rx(), scanner.async_get_rx()) == [RX, RX]
+    assert run_cmd.call_count == 1
+    assert await scanner.async_get_rx() == RX
+    assert run_cmd.call_count == 2
+
+
+@pytest.fixture
+def patched_datetime():
+    """Patch the clock used by the transfer rate calculations."""
+    with patch("aioasuswrt.asuswrt.datetime") as mocked_datetime:
+        yield mocked_datetime
 
 
-@pytest.mark.asyncio
-async def test_async_get_temperature(event_loop, mocker):
+async def test_get_current_transfer_rates(run_cmd, patched_datetime):
+    """Test the transfer rates calculated between two polls."""
+    start = datetime(2021, 1, 1)
+    patched_datetime.utcnow.side_effect = [start] * 2 + [start + timedelta(seconds=60)] * 2
+    run_cmd.side_effect = [RX_DATA, TX_DATA, (str(RX + 6000), ""), (str(TX + 1200), "")]
+    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+    assert await scanner.async_get_current_transfer_rates() == (0, 0)
+    assert await scanner.async_get_current_transfer_rates() == (100, 20)
+
+
+@pytest.mark.parametrize(
+    "temp_data,expected",
+    [
+        (TEMP_DATA, {"2.4GHz": 49.5, "5.0GHz": 54.5, "CPU": 77.0}),
+        (TEMP_DATA_2ND, {"2.4GHz": 0.0, "5.0GHz": 0.0, "CPU": 81.3}),
+    ],
+)
+async def test_async_get_temperature(run_cmd, temp_data, expected):
     """Test getting temperature."""
-    mock_run_cmd(mocker, TEMP_DATA)
+    run_cmd.side_effect = temp_data
     scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
     data = await scanner.async_get_temperature()
-    assert data == {"2.4GHz": 49.5, "5.0GHz": 54.5, "CPU": 77.0}
+    assert data == expected
+
 
-    mock_run_cmd(mocker, TEMP_DATA_2ND)
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+async def test_async_get_temperature_known_commands(run_cmd):
+    """Test getting temperature with the commands already found."""
+    run_cmd.side_effect = lambda command, *args, **kwargs: _TEMP_RESPONSES.get(command)
+    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+    scanner._temps_commands = list(_TEMPS_COMMANDS_DEFAULT)
     data = await scanner.async_get_temperature()
-    assert data == {"2.4GHz": 0.0, "5.0GHz": 0.0, "CPU": 81.3}
+    assert data == {"2.4GHz": 49.5, "5.0GHz": 54.5, "CPU": 77.0}
 
 
-@pytest.mark.asyncio
-async def test_async_get_loadavg(event_loop, mocker):
+async def test_async_get_loadavg(run_cmd, scanner):
     """Test getting loadavg."""
-    mock_run_cmd(mocker, [LOADAVG_DATA])
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+    run_cmd.side_effect = [LOADAVG_DATA]
     data = await scanner.async_get_loadavg()
     assert data == [0.23, 0.5, 0.68]
 
 
-@pytest.mark.asyncio
-async def test_async_get_interfaces_counts(event_loop, mocker):
+async def test_async_get_interfaces_counts(run_cmd, scanner):
     """Test getting loadavg."""
-    mock_run_cmd(mocker, [NETDEV_DATA])
-    scanner = AsusWrt(host="localhost", port=22, mode="ap", require_ip=False)
+    run_cmd.side_effect = [NETDEV_DATA]
     data = await scanner.async_get_interfaces_counts()
     assert data == INTERFACES_COUNT
 
 
-# @pytest.mark.asyncio
-# async def test_async_get_meminfo(event_loop, mocker):
+async def test_async_get_interfaces_counts_no_space(run_cmd, scanner):
+    """Test getting counters when the first counter touches the colon."""
+    netdev_line = "eth0:1376394855 180111514 0 0 0 0 0 0 896208608 161258260 0 0 0 0 0 0"
+    run_cmd.side_effect = [[*NETDEV_DATA[:2], netdev_line, ""]]
+    data = await scanner.async_get_interfaces_counts()
+    assert data == {"eth0": INTERFACES_COUNT["eth0"]}
+
+
+# async def test_async_get_meminfo(mocker):
 #     """Test getting meminfo."""
 #     mocker.patch(
 #         'aioasuswrt.connection.SshConnection.async_run_command',